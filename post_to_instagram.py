@@ -22,17 +22,30 @@ Usage:
 
 import argparse
 import csv
+import itertools
 import os
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 GRAPH_FACEBOOK_BASE = "https://graph.facebook.com/v21.0"
 CSV_PATH = "captions.csv"
+MAX_WORKERS = 4  # rows prepared concurrently when --limit > 1
+
+_TRUTHY = frozenset(("1", "true", "yes", "y", "t"))
+_FALSY = frozenset(("0", "false", "no", "n", "f"))
+
+# One keep-alive connection pool for every Graph API call, so the TLS
+# handshake is paid once instead of per create/poll/publish request.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
 
 
 def get_env_var(name: str) -> str:
@@ -82,13 +95,11 @@ def save_rows(csv_path: str, rows: List[Dict[str, str]]) -> None:
 
 
 def is_truthy(value: str) -> bool:
-    v = (value or "").strip().lower()
-    return v in ("1", "true", "yes", "y", "t")
+    return (value or "").strip().lower() in _TRUTHY
 
 
 def is_falsy(value: str) -> bool:
-    v = (value or "").strip().lower()
-    return v in ("0", "false", "no", "n", "f")
+    return (value or "").strip().lower() in _FALSY
 
 
 def row_is_pending(row: Dict[str, str]) -> bool:
@@ -118,7 +129,7 @@ def create_media_container(ig_user_id: str, access_token: str, image_url: str, c
         "access_token": access_token,
     }
 
-    resp = requests.post(endpoint, params=params, timeout=30)
+    resp = SESSION.post(endpoint, params=params, timeout=30)
     if resp.status_code != 200:
         raise RuntimeError(
             f"Error creating media container: {resp.status_code} {resp.text}"
@@ -133,9 +144,13 @@ def create_media_container(ig_user_id: str, access_token: str, image_url: str, c
 
 
 def wait_for_container_ready(creation_id: str, access_token: str,
-                             max_attempts: int = 10, delay: float = 2.0) -> None:
+                             timeout: float = 30.0, base_delay: float = 0.5,
+                             max_delay: float = 4.0) -> None:
     """
-    Poll the container status until it's FINISHED or we give up.
+    Poll the container status until it's FINISHED or `timeout` seconds pass.
+
+    The first check is immediate; after that the delay doubles from
+    `base_delay` up to `max_delay`, plus a little jitter.
     """
     endpoint = f"{GRAPH_FACEBOOK_BASE}/{creation_id}"
     params = {
@@ -143,8 +158,10 @@ def wait_for_container_ready(creation_id: str, access_token: str,
         "access_token": access_token,
     }
 
-    for attempt in range(1, max_attempts + 1):
-        resp = requests.get(endpoint, params=params, timeout=30)
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        resp = SESSION.get(endpoint, params=params, timeout=30)
         if resp.status_code != 200:
             raise RuntimeError(
                 f"Error checking container status: {resp.status_code} {resp.text}"
@@ -156,10 +173,16 @@ def wait_for_container_ready(creation_id: str, access_token: str,
         elif status == "ERROR":
             raise RuntimeError(f"Container {creation_id} ended in ERROR: {data}")
 
-        time.sleep(delay)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        delay = min(max_delay, base_delay * (2 ** attempt)) + random.uniform(0, 0.25)
+        time.sleep(min(delay, remaining))
+        attempt += 1
 
     raise RuntimeError(
-        f"Container {creation_id} did not reach FINISHED after {max_attempts} attempts"
+        f"Container {creation_id} did not reach FINISHED within {timeout:g}s "
+        f"({attempt + 1} checks)"
     )
 
 
@@ -173,7 +196,7 @@ def publish_media(ig_user_id: str, access_token: str, creation_id: str) -> str:
         "access_token": access_token,
     }
 
-    resp = requests.post(endpoint, params=params, timeout=30)
+    resp = SESSION.post(endpoint, params=params, timeout=30)
     if resp.status_code != 200:
         raise RuntimeError(
             f"Error publishing media: {resp.status_code} {resp.text}"
@@ -187,25 +210,88 @@ def publish_media(ig_user_id: str, access_token: str, creation_id: str) -> str:
     return ig_media_id
 
 
-def post_single_row(ig_user_id: str, access_token: str, row: Dict[str, str]) -> str:
+def row_label(idx: int, row: Dict[str, str]) -> str:
+    return f"row #{idx + 1} (Post No.: {row.get('Post No.', '')})"
+
+
+def prepare_row(ig_user_id: str, access_token: str, idx: int, row: Dict[str, str]) -> str:
     """
-    Full flow for one row: create container -> wait -> publish.
+    Step 1 for one row: create the container and wait until it's ready.
     """
+    label = row_label(idx, row)
     image_url = row["image_url"]
     caption = row.get("caption", "")
 
-    print(f"  • Creating media container for: {image_url}")
+    print(f"  • [{label}] Creating media container for: {image_url}")
     creation_id = create_media_container(ig_user_id, access_token, image_url, caption)
 
-    print(f"    Container created: {creation_id}, waiting to finish…")
+    print(f"    [{label}] Container created: {creation_id}, waiting to finish…")
     wait_for_container_ready(creation_id, access_token)
+    return creation_id
+
 
-    print("    Publishing media…")
+def publish_row(ig_user_id: str, access_token: str, idx: int, row: Dict[str, str],
+                creation_id: str) -> str:
+    """
+    Step 2 for one row: publish its ready container.
+    """
+    label = row_label(idx, row)
+    print(f"    [{label}] Publishing media…")
     media_id = publish_media(ig_user_id, access_token, creation_id)
-    print(f"    ✅ Published! Media ID: {media_id}")
+    print(f"    ✅ [{label}] Published! Media ID: {media_id}")
     return media_id
 
 
+def prepare_rows(ig_user_id: str, access_token: str, rows: List[Dict[str, str]],
+                 batch: List[int]) -> Dict[int, str]:
+    """
+    Run step 1 for every row in `batch`, concurrently when there is more
+    than one. Returns creation ids keyed by row index; failed rows are
+    marked and left out.
+    """
+    creation_ids: Dict[int, str] = {}
+
+    if len(batch) == 1:
+        idx = batch[0]
+        try:
+            creation_ids[idx] = prepare_row(ig_user_id, access_token, idx, rows[idx])
+        except Exception as e:
+            mark_failed(idx, rows[idx], e, stage="prepare")
+        return creation_ids
+
+    # Container creation and status polling are network-bound, so overlap
+    # them across rows.
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batch))) as ex:
+        futures = {
+            ex.submit(prepare_row, ig_user_id, access_token, i, rows[i]): i
+            for i in batch
+        }
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            try:
+                creation_ids[idx] = fut.result()
+            except Exception as e:
+                mark_failed(idx, rows[idx], e, stage="prepare")
+
+    return creation_ids
+
+
+def mark_posted(row: Dict[str, str], media_id: str) -> None:
+    row.update({
+        "posted": "1",
+        "posted_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "instagram_media_id": media_id,
+        "error": "",
+    })
+
+
+def mark_failed(idx: int, row: Dict[str, str], exc: Exception, stage: str) -> None:
+    msg = str(exc)
+    print(f"    ❌ Failed to {stage} {row_label(idx, row)}: {msg}", file=sys.stderr)
+    # Record the error but don't mark as posted
+    row["error"] = msg[:500]  # avoid insane length
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Post queued images to Instagram via Graph API (captions.csv).")
     parser.add_argument(
@@ -220,41 +306,49 @@ def main() -> None:
     access_token = get_env_var("IG_ACCESS_TOKEN")
 
     rows = load_rows(CSV_PATH)
-    pending_indices = [i for i, r in enumerate(rows) if row_is_pending(r)]
+    # Scan lazily: with the default --limit 1 we stop at the first pending row
+    pending = (i for i, r in enumerate(rows) if row_is_pending(r))
+    first_idx = next(pending, None)
 
-    if not pending_indices:
+    if first_idx is None:
         print("No pending posts found in captions.csv (all either posted or _to_post is falsy).")
         return
 
-    print(f"Found {len(pending_indices)} pending rows. Will publish up to {args.limit}.\n")
+    print(f"Will publish up to {args.limit} pending row(s).\n")
 
+    pending = itertools.chain([first_idx], pending)
     posted_count = 0
-    now_iso = lambda: datetime.utcnow().isoformat(timespec="seconds") + "Z"
-
-    for idx in pending_indices:
-        if posted_count >= args.limit:
-            break
-
-        row = rows[idx]
-        print(f"Posting row #{idx + 1} (Post No.: {row.get('Post No.', '')})")
-
-        try:
-            media_id = post_single_row(ig_user_id, access_token, row)
-            # Mark as posted
-            row["posted"] = "1"
-            row["posted_at"] = now_iso()
-            row["instagram_media_id"] = media_id
-            row["error"] = ""
-            posted_count += 1
-            print("")
-        except Exception as e:
-            msg = str(e)
-            print(f"    ❌ Failed to publish this row: {msg}", file=sys.stderr)
-            # Record the error but don't mark as posted
-            row["error"] = msg[:500]  # avoid insane length
 
-    save_rows(CSV_PATH, rows)
-    print(f"Done. Successfully published {posted_count} post(s).")
+    try:
+        # Each round tops the batch back up to the limit, so rows that fail
+        # are replaced by the next pending ones.
+        while posted_count < args.limit:
+            batch = list(itertools.islice(pending, args.limit - posted_count))
+            if not batch:
+                break
+
+            creation_ids = prepare_rows(ig_user_id, access_token, rows, batch)
+
+            # Publish one at a time in CSV order so the feed follows the schedule
+            for idx in batch:
+                if idx not in creation_ids:
+                    continue
+
+                row = rows[idx]
+                try:
+                    media_id = publish_row(ig_user_id, access_token, idx, row, creation_ids[idx])
+                    mark_posted(row, media_id)
+                    posted_count += 1
+                    print("")
+                except Exception as e:
+                    mark_failed(idx, row, e, stage="publish")
+    finally:
+        # Persist progress even if the run is interrupted mid-batch
+        save_rows(CSV_PATH, rows)
+
+    remaining = sum(1 for r in rows if row_is_pending(r))
+    print(f"Done. Successfully published {posted_count} post(s). "
+          f"{remaining} pending row(s) left in captions.csv.")
 
 
 if __name__ == "__main__":